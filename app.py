@@ -1,25 +1,45 @@
+import os
+import re
+import zlib
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import plotly.express as px
 import plotly.graph_objects as go
+from pandas.api.types import union_categoricals
 
-# Predefined dictionary of country coordinates
-COUNTRY_COORDINATES = {
-    'China': (35.8617, 104.1954),
-    'India': (20.5937, 78.9629),
-    'UK': (55.3781, -3.4360),
-    'Germany': (51.1657, 10.4515),
-    'France': (46.6034, 1.8883),
-    'Australia': (-25.2744, 133.7751),
-    'Russia': (61.5240, 105.3188),
-    'Brazil': (-14.2350, -51.9253),
-    'Japan': (36.2048, 138.2529),
-    'USA': (37.0902, -95.7129)
-}
+from constants import (
+    CACHE_REQUIRED_ATTRS, CATEGORY_COLUMNS, COUNTRY_COORDINATES, CSV_CHUNK_ROWS, CSV_DTYPES, CSV_PATH,
+    LOADER_VERSION, NUMERIC_COLUMNS, NUMERIC_DTYPES, PARQUET_CACHE_PATTERN, PARQUET_CACHE_TEMPLATE,
+    REQUIRED_COLUMNS
+)
+
+# Coordinate lookup table built once per process, one float32 row per supported country
+COORDINATE_TABLE = pd.DataFrame.from_dict(
+    COUNTRY_COORDINATES, orient='index', columns=['lat', 'lon'], dtype='float32'
+)
+
+# Largest map bubble diameter in pixels
+MAP_MAX_MARKER_SIZE = 20
+
+# Hover label for map bubbles, filled from each marker's text and customdata
+MAP_HOVER_TEMPLATE = '%{text} | %{customdata[0]:,} incidents | $%{customdata[1]:.1f}M'
+
+# Above this many incidents the box plots are drawn from precomputed statistics
+BOX_PRECOMPUTE_ROWS = 10000
+
+# Color of the box plots and their beyond-whisker points (plotly express' first default color)
+BOX_COLOR = px.colors.qualitative.Plotly[0]
+
+# Above this many incidents the analytics scatter plots a stratified sample
+SCATTER_SAMPLE_SIZE = 10000
+
+# Maximum entries kept by each filter-keyed cache
+FIGURE_CACHE_ENTRIES = 16
 
 # Custom CSS for a cleaner UI
-st.markdown(
-    """
+CSS_BLOCK = """
     <style>
     .main-title {
         font-size: 36px;
@@ -38,13 +58,6 @@ st.markdown(
         color: #333;
         margin-bottom: 20px;
     }
-    .section-header {
-        font-size: 22px;
-        font-weight: bold;
-        color: #2E8B57;
-        margin-top: 30px;
-        margin-bottom: 10px;
-    }
     .warning-box {
         background-color: #FFF3CD;
         color: #856404;
@@ -68,76 +81,410 @@ st.markdown(
         border-top: 1px solid #ddd;
     }
     </style>
-    """,
-    unsafe_allow_html=True
-)
+    """
+
+# Inject the custom CSS once; Streamlit replays it on reruns
+@st.cache_resource
+def inject_css():
+    st.markdown(CSS_BLOCK, unsafe_allow_html=True)
+
+inject_css()
 
-@st.cache_data
-def load_data():
+def load_failure(message):
+    # Return an empty frame carrying the load error for the caller to display
+    df = pd.DataFrame()
+    df.attrs['load_error'] = message
+    return df
+
+def compute_filter_domain(df):
+    # Compute the sidebar filter bounds (shortest float repr keeps the slider at 99.99)
+    return {
+        'year_min': int(df['Year'].min()),
+        'year_max': int(df['Year'].max()),
+        'loss_min': float(str(df['Financial_Loss_Millions'].min())),
+        'loss_max': float(str(df['Financial_Loss_Millions'].max())),
+        'attack_types': sorted(df['Attack Type'].unique().tolist())
+    }
+
+# Load and clean the CSV once per file version; the shared frame must be treated as read-only
+@st.cache_resource(max_entries=1)
+def load_data(csv_mtime):
     try:
-        # Load data from CSV
-        df = pd.read_csv('Global_Cybersecurity_Threats_2015-2024.csv', delimiter=",")
+        # Reuse the cleaned frame cached on disk for this CSV and loader configuration
+        cache_path = None
+        if csv_mtime is not None:
+            settings = zlib.crc32(repr((
+                LOADER_VERSION, REQUIRED_COLUMNS, COUNTRY_COORDINATES, CSV_DTYPES, NUMERIC_DTYPES
+            )).encode())
+            cache_path = PARQUET_CACHE_TEMPLATE.format(mtime=csv_mtime, settings=settings)
+            if os.path.exists(cache_path):
+                try:
+                    cached = pd.read_parquet(cache_path, engine='pyarrow')
+                except (OSError, ValueError, pa.ArrowException):
+                    # Discard an unreadable cache file and fall back to parsing the CSV
+                    cached = None
+                    try:
+                        os.remove(cache_path)
+                    except OSError:
+                        pass
+                if cached is not None and all(attr in cached.attrs for attr in CACHE_REQUIRED_ATTRS):
+                    cached.attrs['data_version'] = csv_mtime
+                    return cached
         
-        # Strip whitespace from column names
-        df.columns = df.columns.str.strip()
+        # Read the header first so required columns can be matched after stripping whitespace
+        raw_columns = {col.strip(): col for col in pd.read_csv(CSV_PATH, nrows=0).columns}
         
         # Check for required columns
-        required_columns = [
-            'Country', 'Year', 'Attack Type', 'Target Industry', 'Financial Loss (in Million $)',
-            'Number of Affected Users', 'Attack Source', 'Security Vulnerability Type',
-            'Defense Mechanism Used', 'Incident Resolution Time (in Hours)'
-        ]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in raw_columns]
         if missing_columns:
-            st.markdown(f'<div class="error-box">Missing columns in the DataFrame: {", ".join(missing_columns)}</div>', unsafe_allow_html=True)
-            st.stop()
+            return load_failure(f'Missing columns in the DataFrame: {", ".join(missing_columns)}')
+        
+        # Read the required columns in chunks, dropping unusable rows before accumulating them
+        chunks = []
+        dropped_rows = 0
+        for chunk in pd.read_csv(
+            CSV_PATH,
+            usecols=[raw_columns[col] for col in REQUIRED_COLUMNS],
+            dtype={raw_columns[col]: dtype for col, dtype in CSV_DTYPES.items()},
+            chunksize=CSV_CHUNK_ROWS
+        ):
+            # Strip whitespace from column names and rename columns for easier access
+            chunk.columns = chunk.columns.str.strip()
+            chunk = chunk.rename(columns={
+                'Financial Loss (in Million $)': 'Financial_Loss_Millions',
+                'Incident Resolution Time (in Hours)': 'Resolution_Time_Hours'
+            })
+            
+            # Convert numerical columns, turning unparseable cells into NaN
+            for col in NUMERIC_COLUMNS:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+            
+            # Keep rows for supported countries with every numerical value present
+            supported = category_mask(chunk['Country'], list(COUNTRY_COORDINATES))
+            dropped_rows += int((~supported).sum())
+            complete = chunk[NUMERIC_COLUMNS].notna().all(axis=1).to_numpy()
+            
+            # Drop integers that the narrow dtype cannot hold, since astype would wrap them silently
+            for col, dtype in NUMERIC_DTYPES.items():
+                if np.dtype(dtype).kind == 'i':
+                    limits = np.iinfo(dtype)
+                    complete &= chunk[col].between(limits.min, limits.max).to_numpy()
+            chunks.append(chunk[supported & complete].astype(NUMERIC_DTYPES))
         
-        # Rename columns for easier access
-        df = df.rename(columns={
-            'Financial Loss (in Million $)': 'Financial_Loss_Millions',
-            'Incident Resolution Time (in Hours)': 'Resolution_Time_Hours'
-        })
+        # Each chunk infers its own category set; align them so concat keeps the categoricals
+        for col in CATEGORY_COLUMNS:
+            categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+        df = pd.concat(chunks, ignore_index=True)
         
-        # Convert numerical columns to appropriate types
-        df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-        df['Financial_Loss_Millions'] = pd.to_numeric(df['Financial_Loss_Millions'], errors='coerce')
-        df['Number of Affected Users'] = pd.to_numeric(df['Number of Affected Users'], errors='coerce')
-        df['Resolution_Time_Hours'] = pd.to_numeric(df['Resolution_Time_Hours'], errors='coerce')
+        # Standardize Attack Type by normalizing the category labels
+        attack_labels = df['Attack Type'].cat.categories
+        df['Attack Type'] = df['Attack Type'].map(dict(zip(attack_labels, attack_labels.str.strip().str.upper())))
         
-        # Drop rows with invalid numerical values
-        df = df.dropna(subset=['Year', 'Financial_Loss_Millions', 'Number of Affected Users', 'Resolution_Time_Hours'])
-        df['Year'] = df['Year'].astype(int)
+        # Ensure Resolution Time is positive for scatter plot sizing (in place when the array is writeable)
+        resolution_hours = df['Resolution_Time_Hours'].to_numpy()
+        if resolution_hours.flags.writeable:
+            np.maximum(resolution_hours, 1.0, out=resolution_hours)
+        else:
+            df['Resolution_Time_Hours'] = np.maximum(resolution_hours, 1.0)
+        
+        # Add coordinates by looking up each country's category code
+        df['Country'] = df['Country'].cat.remove_unused_categories()
+        coordinates = COORDINATE_TABLE.reindex(df['Country'].cat.categories).to_numpy()
+        country_codes = df['Country'].cat.codes.to_numpy()
+        df['lat'] = coordinates[country_codes, 0]
+        df['lon'] = coordinates[country_codes, 1]
         
-        # Standardize Attack Type
-        df['Attack Type'] = df['Attack Type'].str.strip().str.upper()
+        # Re-establish categoricals for columns the cleaning steps turned back into strings
+        for col in CATEGORY_COLUMNS:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
         
-        # Ensure Resolution Time is positive for scatter plot sizing
-        df['Resolution_Time_Hours'] = df['Resolution_Time_Hours'].clip(lower=1)
+        # Record dropped rows and the data version for the caller and the derived caches
+        df.attrs['dropped_rows'] = dropped_rows
+        df.attrs['data_version'] = csv_mtime
         
-        # Add coordinates using predefined dictionary
-        df['lat'] = df['Country'].map(lambda x: COUNTRY_COORDINATES.get(x, (None, None))[0])
-        df['lon'] = df['Country'].map(lambda x: COUNTRY_COORDINATES.get(x, (None, None))[1])
+        # Materialize the filter widget bounds once so reruns never rescan the columns
+        df.attrs['filter_domain'] = compute_filter_domain(df) if not df.empty else None
         
-        # Drop rows with invalid coordinates
-        initial_len = len(df)
-        df = df.dropna(subset=['lat', 'lon'])
-        if len(df) < initial_len:
-            st.markdown(
-                f'<div class="warning-box">Dropped {initial_len - len(df)} rows due to missing coordinates for some countries. '
-                f'Supported countries: {", ".join(COUNTRY_COORDINATES.keys())}</div>',
-                unsafe_allow_html=True
-            )
+        # Write the disk cache atomically and remove caches for earlier CSV versions
+        try:
+            df.to_parquet(cache_path + '.tmp', engine='pyarrow', compression='zstd')
+            os.replace(cache_path + '.tmp', cache_path)
+            for stale_path in os.listdir('.'):
+                if stale_path != cache_path and re.fullmatch(PARQUET_CACHE_PATTERN, stale_path):
+                    os.remove(stale_path)
+        except OSError:
+            pass
         
         return df
     except FileNotFoundError:
-        st.markdown('<div class="error-box">The file "Global_Cybersecurity_Threats_2015-2024.csv" was not found. Please upload the correct file.</div>', unsafe_allow_html=True)
-        return pd.DataFrame()
+        return load_failure('The file "Global_Cybersecurity_Threats_2015-2024.csv" was not found. Please upload the correct file.')
     except Exception as e:
-        st.markdown(f'<div class="error-box">Error loading data: {str(e)}</div>', unsafe_allow_html=True)
-        return pd.DataFrame()
+        return load_failure(f'Error loading data: {str(e)}')
+
+@st.cache_data(max_entries=1)
+def get_loss_grid(_df, data_version):
+    # Financial loss totals per (Country, Year, Attack Type): a few hundred rows however large the data is
+    return _df.groupby(['Country', 'Year', 'Attack Type'], observed=True, as_index=False)['Financial_Loss_Millions'].sum()
+
+def category_mask(series, labels):
+    # Membership mask for a categorical column via a lookup table indexed by category code
+    categories = series.cat.categories
+    selected = categories.get_indexer(labels)
+    allowed = np.zeros(len(categories) + 1, dtype=bool)
+    allowed[selected[selected >= 0]] = True
+    return allowed[series.cat.codes.to_numpy()]
+
+def apply_filters(data, year_range, attack_types, loss_range):
+    # Combine the attack type mask with the year and loss ranges
+    years = data['Year'].to_numpy()
+    losses = data['Financial_Loss_Millions'].to_numpy()
+    mask = category_mask(data['Attack Type'], attack_types)
+    mask &= years >= year_range[0]
+    mask &= years <= year_range[1]
+    mask &= losses >= loss_range[0]
+    mask &= losses <= loss_range[1]
+    return data[mask]
+
+# Shared as a resource so cache hits return the frame without unpickling it; treat it as read-only
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_filtered_data(_df, filter_key):
+    data_version, year_range, attack_types, loss_range = filter_key
+    return apply_filters(_df, year_range, attack_types, loss_range)
+
+def get_loss_by_year_and_country(df, filtered_df, filter_key, full_loss_range):
+    # Year x Country loss matrix, from the pre-aggregated grid unless loss bounds are applied
+    data_version, year_range, attack_types, loss_range = filter_key
+    source = filtered_df
+    if full_loss_range:
+        loss_grid = get_loss_grid(df, data_version)
+        source = loss_grid[loss_grid['Year'].between(*year_range).to_numpy() & category_mask(loss_grid['Attack Type'], attack_types)]
+    return source.pivot_table(
+        index='Year', columns='Country', values='Financial_Loss_Millions', aggfunc='sum', observed=True
+    )
+
+def sample_for_scatter(data):
+    # Stratified sample per attack type, keeping at least one point per type
+    if len(data) <= SCATTER_SAMPLE_SIZE:
+        return data
+    codes = data['Attack Type'].cat.codes.to_numpy()
+    quotas = np.maximum(1, np.bincount(codes) * SCATTER_SAMPLE_SIZE // len(data))
+    
+    # Shuffle row positions only, take each type's first quota rows, and gather just those rows
+    order = np.random.default_rng(0).permutation(len(data))
+    shuffled_codes = codes[order]
+    rank = pd.Series(shuffled_codes).groupby(shuffled_codes).cumcount().to_numpy()
+    return data.iloc[np.sort(order[rank < quotas[shuffled_codes]])]
+
+def category_counts(series):
+    # Count rows per label for the pie charts, leaving out empty categories
+    counts = series.value_counts()
+    return counts[counts > 0].rename_axis(series.name).reset_index(name='Count')
+
+def build_box_plot(data, by, value, value_label):
+    # Use px.box for small selections, otherwise precompute the boxes the way plotly.js does
+    if len(data) <= BOX_PRECOMPUTE_ROWS:
+        return px.box(data, x=by, y=value, labels={value: value_label})
+    
+    # Quartiles with plotly.js' default 'linear' method (Hazen), categories in order of first appearance
+    values = data[value]
+    groups = values.groupby(data[by], observed=True, sort=False)
+    stats = pd.DataFrame.from_dict(
+        {key: np.quantile(group.to_numpy(), [0.25, 0.5, 0.75], method='hazen') for key, group in groups},
+        orient='index',
+        columns=['q1', 'median', 'q3']
+    )
+    iqr = stats['q3'] - stats['q1']
+    lower_limit = data[by].map(stats['q1'] - 1.5 * iqr).astype('float64')
+    upper_limit = data[by].map(stats['q3'] + 1.5 * iqr).astype('float64')
+    stats['lowerfence'] = values.where(values >= lower_limit).groupby(data[by], observed=True).min()
+    stats['upperfence'] = values.where(values <= upper_limit).groupby(data[by], observed=True).max()
+    outliers = ((values < lower_limit) | (values > upper_limit)).to_numpy()
+    
+    fig = go.Figure(go.Box(
+        x=stats.index.astype(str),
+        q1=stats['q1'],
+        median=stats['median'],
+        q3=stats['q3'],
+        lowerfence=stats['lowerfence'],
+        upperfence=stats['upperfence'],
+        marker_color=BOX_COLOR
+    ))
+    fig.add_trace(go.Scattergl(
+        x=data[by][outliers].astype(str),
+        y=values[outliers],
+        mode='markers',
+        marker_color=BOX_COLOR,
+        showlegend=False,
+        hovertemplate=f'{by}=%{{x}}<br>{value_label}=%{{y}}<extra></extra>'
+    ))
+    fig.update_layout(xaxis_title=by, yaxis_title=value_label)
+    return fig
+
+def attack_type_colors(attack_types):
+    # Assign each attack type a fixed color by its position in the full category list
+    palette = px.colors.qualitative.Plotly
+    return {attack_type: palette[i % len(palette)] for i, attack_type in enumerate(attack_types)}
+
+def build_incident_map(data):
+    # Aggregate incidents into one bubble per country and attack type
+    data = data.groupby(['Country', 'Attack Type', 'lat', 'lon'], observed=True, as_index=False).agg(
+        Financial_Loss_Millions=('Financial_Loss_Millions', 'sum'),
+        Incidents=('Year', 'size')
+    )
+
+    # Scale marker area the same way plotly express does so bubble sizes stay comparable
+    sizeref = 2.0 * data['Financial_Loss_Millions'].max() / MAP_MAX_MARKER_SIZE ** 2
+    colors = attack_type_colors(data['Attack Type'].cat.categories)
+
+    fig = go.Figure()
+    for attack_type, group in data.groupby('Attack Type', observed=True, sort=True):
+        fig.add_trace(go.Scattermapbox(
+            lat=group['lat'],
+            lon=group['lon'],
+            mode='markers',
+            name=attack_type,
+            marker=dict(
+                size=group['Financial_Loss_Millions'],
+                sizemode='area',
+                sizeref=sizeref,
+                color=colors[attack_type]
+            ),
+            # Format hover labels in the browser from the numeric customdata
+            text=group['Country'],
+            customdata=group[['Incidents', 'Financial_Loss_Millions']].to_numpy(dtype=np.float32),
+            hovertemplate=MAP_HOVER_TEMPLATE
+        ))
+    fig.update_layout(legend_title_text='Attack Type')
+    return fig
+
+# Cache built figures per filter combination; Streamlit only serializes them
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_incident_map(_filtered_df, filter_key, map_style):
+    fig_map = build_incident_map(_filtered_df)
+    fig_map.update_layout(
+        title="Global Cybersecurity Incidents",
+        height=800,
+        mapbox_style=map_style,
+        margin={"r":0, "t":50, "l":0, "b":0},
+        mapbox=dict(
+            center=dict(lat=20, lon=0),
+            zoom=1
+        )
+    )
+    return fig_map
+
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_analytics_figures(_df, _filtered_df, filter_key, full_loss_range):
+    # Year x Country loss matrix shared by the bar and line charts
+    loss_pivot = get_loss_by_year_and_country(_df, _filtered_df, filter_key, full_loss_range)
+    
+    # Visualization 1: Financial Loss by Country (Bar Chart)
+    fig1 = px.bar(
+        loss_pivot.sum(axis=0).reset_index(name='Financial_Loss_Millions'),
+        x='Country',
+        y='Financial_Loss_Millions',
+        title="Total Financial Loss by Country (Filtered Data)",
+        labels={'Financial_Loss_Millions': 'Financial Loss (in Million $)'}
+    )
+    fig1.update_layout(xaxis_tickangle=45)
+    
+    # Visualization 2: Financial Loss vs Affected Users (Scatter Plot)
+    scatter_df = sample_for_scatter(_filtered_df)
+    fig2 = px.scatter(
+        scatter_df,
+        x='Number of Affected Users',
+        y='Financial_Loss_Millions',
+        color='Attack Type',
+        color_discrete_map=attack_type_colors(_filtered_df['Attack Type'].cat.categories),
+        size='Resolution_Time_Hours',
+        hover_data=['Country', 'Year'],
+        title="Financial Impact vs User Affection (Filtered Data)",
+        labels={
+            'Financial_Loss_Millions': 'Financial Loss (in Million $)',
+            'Resolution_Time_Hours': 'Resolution Time (Hours)'
+        },
+        render_mode='webgl'
+    )
+    
+    # Visualization 3: Financial Loss Over Time (Line Plot)
+    fig3 = px.line(
+        loss_pivot.stack(future_stack=True).dropna().reset_index(name='Financial_Loss_Millions'),
+        x='Year',
+        y='Financial_Loss_Millions',
+        color='Country',
+        title="Financial Loss Over Time by Country (Filtered Data)",
+        labels={'Financial_Loss_Millions': 'Financial Loss (in Million $)'},
+        markers=True
+    )
+    
+    # Visualization 4: Distribution of Attack Types (Pie Chart)
+    fig4 = px.pie(
+        category_counts(_filtered_df['Attack Type']),
+        names='Attack Type',
+        values='Count',
+        title="Distribution of Attack Types (Filtered Data)",
+        hole=0.3
+    )
+    
+    # Visualization 5: Distribution of Target Industries (Pie Chart)
+    fig5 = px.pie(
+        category_counts(_filtered_df['Target Industry']),
+        names='Target Industry',
+        values='Count',
+        title="Distribution of Target Industries (Filtered Data)",
+        hole=0.3
+    )
+    
+    # Visualization 6: Heatmap of Attack Types by Country
+    heatmap_counts = pd.crosstab(_filtered_df['Attack Type'], _filtered_df['Country'])
+    fig6 = px.imshow(
+        heatmap_counts,
+        labels={'x': 'Country', 'y': 'Attack Type', 'color': 'Count'},
+        title="Heatmap of Attack Types by Country (Filtered Data)",
+        color_continuous_scale='Viridis',
+        aspect='auto'
+    )
+    fig6.update_layout(xaxis_tickangle=45)
+    
+    # Visualization 7: Box Plot of Financial Loss by Attack Type
+    fig7 = build_box_plot(_filtered_df, 'Attack Type', 'Financial_Loss_Millions', 'Financial Loss (in Million $)')
+    fig7.update_layout(
+        title="Distribution of Financial Loss by Attack Type (Filtered Data)",
+        xaxis_tickangle=45
+    )
+    
+    # Visualization 8: Box Plot of Resolution Time by Target Industry
+    fig8 = build_box_plot(_filtered_df, 'Target Industry', 'Resolution_Time_Hours', 'Resolution Time (Hours)')
+    fig8.update_layout(
+        title="Distribution of Resolution Time by Target Industry (Filtered Data)",
+        xaxis_tickangle=45
+    )
+    
+    figures = {
+        'loss_by_country': fig1,
+        'impact_scatter': fig2,
+        'loss_over_time': fig3,
+        'attack_types': fig4,
+        'target_industries': fig5,
+        'attack_heatmap': fig6,
+        'loss_by_attack_type': fig7,
+        'resolution_by_industry': fig8
+    }
+    return figures, len(scatter_df)
 
 # Load and cache data
-df = load_data()
+df = load_data(os.path.getmtime(CSV_PATH) if os.path.exists(CSV_PATH) else None)
+if df.attrs.get('load_error'):
+    st.markdown(f'<div class="error-box">{df.attrs["load_error"]}</div>', unsafe_allow_html=True)
+if df.attrs.get('dropped_rows'):
+    st.markdown(
+        f'<div class="warning-box">Dropped {df.attrs["dropped_rows"]} rows due to missing coordinates for some countries. '
+        f'Supported countries: {", ".join(COUNTRY_COORDINATES.keys())}</div>',
+        unsafe_allow_html=True
+    )
 
 # Main app
 st.markdown('<div class="main-title">Cybersecurity Incident Dashboard 🌐</div>', unsafe_allow_html=True)
@@ -146,43 +493,44 @@ st.markdown("Explore global cybersecurity incidents from 2015 to 2024 with inter
 # Sidebar
 st.sidebar.markdown('<div class="sidebar-header">Filter Controls</div>', unsafe_allow_html=True)
 
-# Create tabs for map and analytics
-tab1, tab2 = st.tabs(["World Map Visualization", "Dynamic Analytics"])
+# Sidebar filters for year range and attack types, shared by the map and the analytics tab
+if not df.empty:
+    # Fall back to scanning the columns if the bounds were not precomputed
+    domain = df.attrs.get('filter_domain') or compute_filter_domain(df)
+    
+    year_range = st.sidebar.slider(
+        "Select Year Range",
+        min_value=domain['year_min'],
+        max_value=domain['year_max'],
+        value=(domain['year_min'], domain['year_max'])
+    )
+    
+    attack_types = st.sidebar.multiselect(
+        "Select Attack Types",
+        options=domain['attack_types'],
+        default=domain['attack_types']
+    )
+    
+    # Additional filter: Financial Loss Range
+    financial_loss_range = st.sidebar.slider(
+        "Select Financial Loss Range (in Million $)",
+        min_value=domain['loss_min'],
+        max_value=domain['loss_max'],
+        value=(domain['loss_min'], domain['loss_max'])
+    )
+    
+    # Filter data once based on user selections and reuse it in both views
+    filter_key = (df.attrs['data_version'], year_range, tuple(sorted(attack_types)), financial_loss_range)
+    filtered_df = get_filtered_data(df, filter_key)
+
+# Choose the view to render; only the selected one builds its figures
+view = st.radio("View", ["World Map Visualization", "Dynamic Analytics"], horizontal=True)
 
-with tab1:
+if view == "World Map Visualization":
     st.header("Global Threat Map")
     
-    # Check if DataFrame is empty before creating filters
+    # Check if DataFrame is empty before creating the map
     if not df.empty:
-        # Sidebar filters for year range and attack types
-        year_range = st.sidebar.slider(
-            "Select Year Range",
-            min_value=int(df['Year'].min()),
-            max_value=int(df['Year'].max()),
-            value=(int(df['Year'].min()), int(df['Year'].max()))
-        )
-        
-        attack_types = st.sidebar.multiselect(
-            "Select Attack Types",
-            options=sorted(df['Attack Type'].unique()),
-            default=df['Attack Type'].unique()
-        )
-        
-        # Additional filter: Financial Loss Range
-        financial_loss_range = st.sidebar.slider(
-            "Select Financial Loss Range (in Million $)",
-            min_value=float(df['Financial_Loss_Millions'].min()),
-            max_value=float(df['Financial_Loss_Millions'].max()),
-            value=(float(df['Financial_Loss_Millions'].min()), float(df['Financial_Loss_Millions'].max()))
-        )
-        
-        # Filter data based on user selections
-        filtered_df = df[
-            (df['Year'].between(*year_range)) &
-            (df['Attack Type'].isin(attack_types)) &
-            (df['Financial_Loss_Millions'].between(*financial_loss_range))
-        ]
-        
         # Map style selection
         map_style = st.selectbox(
             "Select Map Style",
@@ -190,36 +538,9 @@ with tab1:
             index=0
         )
         
-        # Display map using Plotly scatter_mapbox
+        # Display map using WebGL-backed Scattermapbox traces
         if not filtered_df.empty:
-            fig_map = px.scatter_mapbox(
-                filtered_df,
-                lat='lat',
-                lon='lon',
-                size='Financial_Loss_Millions',
-                color='Attack Type',
-                hover_data={
-                    'Country': True,
-                    'Year': True,
-                    'Attack Type': True,
-                    'Target Industry': True,
-                    'Financial_Loss_Millions': True,
-                    'Number of Affected Users': True,
-                    'Resolution_Time_Hours': True
-                },
-                title="Global Cybersecurity Incidents",
-                zoom=1,
-                height=800
-            )
-            fig_map.update_layout(
-                mapbox_style=map_style,
-                margin={"r":0, "t":50, "l":0, "b":0},
-                mapbox=dict(
-                    center=dict(lat=20, lon=0),
-                    zoom=1
-                )
-            )
-            st.plotly_chart(fig_map, use_container_width=True)
+            st.plotly_chart(get_incident_map(filtered_df, filter_key, map_style), use_container_width=True)
         else:
             st.markdown('<div class="warning-box">No data matching the selected filters.</div>', unsafe_allow_html=True)
     else:
@@ -228,125 +549,40 @@ with tab1:
             unsafe_allow_html=True
         )
 
-with tab2:
+elif view == "Dynamic Analytics":
     st.header("Analytical Visualizations")
     
     if not df.empty:
         try:
-            # Use filtered_df to ensure visualizations reflect the same filters as the map
-            filtered_df = df[
-                (df['Year'].between(*year_range)) &
-                (df['Attack Type'].isin(attack_types)) &
-                (df['Financial_Loss_Millions'].between(*financial_loss_range))
-            ]
-            
+            # filtered_df is shared with the map so visualizations reflect the same filters
             if not filtered_df.empty:
-                # Section 1: Financial Loss and User Impact
-                st.markdown('<div class="section-header">Financial Loss and User Impact</div>', unsafe_allow_html=True)
-                
-                # Visualization 1: Financial Loss by Country (Bar Chart)
-                fig1 = px.bar(
-                    filtered_df.groupby('Country', as_index=False)['Financial_Loss_Millions'].sum(),
-                    x='Country',
-                    y='Financial_Loss_Millions',
-                    title="Total Financial Loss by Country (Filtered Data)",
-                    labels={'Financial_Loss_Millions': 'Financial Loss (in Million $)'}
-                )
-                fig1.update_layout(xaxis_tickangle=45)
-                st.plotly_chart(fig1, use_container_width=True)
+                full_loss_range = financial_loss_range == (domain['loss_min'], domain['loss_max'])
+                figures, scatter_points = get_analytics_figures(df, filtered_df, filter_key, full_loss_range)
                 
-                # Visualization 2: Financial Loss vs Affected Users (Scatter Plot)
-                fig2 = px.scatter(
-                    filtered_df,
-                    x='Number of Affected Users',
-                    y='Financial_Loss_Millions',
-                    color='Attack Type',
-                    size='Resolution_Time_Hours',
-                    hover_data=['Country', 'Year'],
-                    title="Financial Impact vs User Affection (Filtered Data)",
-                    labels={
-                        'Financial_Loss_Millions': 'Financial Loss (in Million $)',
-                        'Resolution_Time_Hours': 'Resolution Time (Hours)'
-                    }
-                )
-                st.plotly_chart(fig2, use_container_width=True)
+                # Section 1: Financial Loss and User Impact
+                st.markdown("### Financial Loss and User Impact")
+                st.plotly_chart(figures['loss_by_country'], use_container_width=True)
+                st.plotly_chart(figures['impact_scatter'], use_container_width=True)
+                if scatter_points < len(filtered_df):
+                    st.caption(f"Displaying a sample of {scatter_points:,} of {len(filtered_df):,} points")
                 
                 # Section 2: Trends Over Time
-                st.markdown('<div class="section-header">Trends Over Time</div>', unsafe_allow_html=True)
-                
-                # Visualization 3: Financial Loss Over Time (Line Plot)
-                fig3 = px.line(
-                    filtered_df.groupby(['Year', 'Country'], as_index=False)['Financial_Loss_Millions'].sum(),
-                    x='Year',
-                    y='Financial_Loss_Millions',
-                    color='Country',
-                    title="Financial Loss Over Time by Country (Filtered Data)",
-                    labels={'Financial_Loss_Millions': 'Financial Loss (in Million $)'},
-                    markers=True
-                )
-                st.plotly_chart(fig3, use_container_width=True)
+                st.markdown("### Trends Over Time")
+                st.plotly_chart(figures['loss_over_time'], use_container_width=True)
                 
                 # Section 3: Distribution of Attacks
-                st.markdown('<div class="section-header">Distribution of Attacks</div>', unsafe_allow_html=True)
-                
-                # Visualization 4: Distribution of Attack Types (Pie Chart)
-                fig4 = px.pie(
-                    filtered_df,
-                    names='Attack Type',
-                    title="Distribution of Attack Types (Filtered Data)",
-                    hole=0.3
-                )
-                st.plotly_chart(fig4, use_container_width=True)
-                
-                # Visualization 5: Distribution of Target Industries (Pie Chart)
-                fig5 = px.pie(
-                    filtered_df,
-                    names='Target Industry',
-                    title="Distribution of Target Industries (Filtered Data)",
-                    hole=0.3
-                )
-                st.plotly_chart(fig5, use_container_width=True)
+                st.markdown("### Distribution of Attacks")
+                st.plotly_chart(figures['attack_types'], use_container_width=True)
+                st.plotly_chart(figures['target_industries'], use_container_width=True)
                 
                 # Section 4: Attack Patterns
-                st.markdown('<div class="section-header">Attack Patterns</div>', unsafe_allow_html=True)
-                
-                # Visualization 6: Heatmap of Attack Types by Country
-                heatmap_data = filtered_df.groupby(['Country', 'Attack Type']).size().reset_index(name='Count')
-                fig6 = px.density_heatmap(
-                    heatmap_data,
-                    x='Country',
-                    y='Attack Type',
-                    z='Count',
-                    title="Heatmap of Attack Types by Country (Filtered Data)",
-                    color_continuous_scale='Viridis'
-                )
-                fig6.update_layout(xaxis_tickangle=45)
-                st.plotly_chart(fig6, use_container_width=True)
+                st.markdown("### Attack Patterns")
+                st.plotly_chart(figures['attack_heatmap'], use_container_width=True)
                 
                 # Section 5: Distribution Analysis
-                st.markdown('<div class="section-header">Distribution Analysis</div>', unsafe_allow_html=True)
-                
-                # Visualization 7: Box Plot of Financial Loss by Attack Type
-                fig7 = px.box(
-                    filtered_df,
-                    x='Attack Type',
-                    y='Financial_Loss_Millions',
-                    title="Distribution of Financial Loss by Attack Type (Filtered Data)",
-                    labels={'Financial_Loss_Millions': 'Financial Loss (in Million $)'}
-                )
-                fig7.update_layout(xaxis_tickangle=45)
-                st.plotly_chart(fig7, use_container_width=True)
-                
-                # Visualization 8: Box Plot of Resolution Time by Target Industry
-                fig8 = px.box(
-                    filtered_df,
-                    x='Target Industry',
-                    y='Resolution_Time_Hours',
-                    title="Distribution of Resolution Time by Target Industry (Filtered Data)",
-                    labels={'Resolution_Time_Hours': 'Resolution Time (Hours)'}
-                )
-                fig8.update_layout(xaxis_tickangle=45)
-                st.plotly_chart(fig8, use_container_width=True)
+                st.markdown("### Distribution Analysis")
+                st.plotly_chart(figures['loss_by_attack_type'], use_container_width=True)
+                st.plotly_chart(figures['resolution_by_industry'], use_container_width=True)
             else:
                 st.markdown('<div class="warning-box">No data matching the selected filters for visualizations.</div>', unsafe_allow_html=True)
         except Exception as e:
@@ -0,0 +1,52 @@
+# Predefined dictionary of country coordinates
+COUNTRY_COORDINATES = {
+    'China': (35.8617, 104.1954),
+    'India': (20.5937, 78.9629),
+    'UK': (55.3781, -3.4360),
+    'Germany': (51.1657, 10.4515),
+    'France': (46.6034, 1.8883),
+    'Australia': (-25.2744, 133.7751),
+    'Russia': (61.5240, 105.3188),
+    'Brazil': (-14.2350, -51.9253),
+    'Japan': (36.2048, 138.2529),
+    'USA': (37.0902, -95.7129)
+}
+
+CSV_PATH = 'Global_Cybersecurity_Threats_2015-2024.csv'
+
+# Rows parsed per CSV chunk; bounds peak memory while loading large exports
+CSV_CHUNK_ROWS = 200_000
+
+# Disk cache of the cleaned CSV, named by CSV modification time and a checksum of the loader settings
+PARQUET_CACHE_TEMPLATE = '.cache_{mtime:.0f}_{settings:08x}.parquet'
+PARQUET_CACHE_PATTERN = r'\.cache_\d+_[0-9a-f]{8}\.parquet'
+
+# Bump whenever load_data's cleaning steps or stored attrs change, to invalidate disk caches
+LOADER_VERSION = 2
+
+# Attrs every cached frame must carry; a cache file missing any of them is rebuilt from the CSV
+CACHE_REQUIRED_ATTRS = ('dropped_rows', 'filter_domain')
+
+REQUIRED_COLUMNS = [
+    'Country', 'Year', 'Attack Type', 'Target Industry', 'Financial Loss (in Million $)',
+    'Number of Affected Users', 'Attack Source', 'Security Vulnerability Type',
+    'Defense Mechanism Used', 'Incident Resolution Time (in Hours)'
+]
+
+# Low-cardinality text columns stored as categoricals so filters and groupbys run on integer codes
+CATEGORY_COLUMNS = [
+    'Country', 'Attack Type', 'Target Industry', 'Attack Source',
+    'Security Vulnerability Type', 'Defense Mechanism Used'
+]
+
+# Declared CSV column types; numeric columns are coerced after parsing so malformed cells drop their row
+CSV_DTYPES = {col: 'category' for col in CATEGORY_COLUMNS}
+
+# Narrow dtypes for the numeric columns after cleaning (affected users can exceed int32)
+NUMERIC_DTYPES = {
+    'Year': 'int16',
+    'Financial_Loss_Millions': 'float32',
+    'Number of Affected Users': 'int64',
+    'Resolution_Time_Hours': 'float32'
+}
+NUMERIC_COLUMNS = list(NUMERIC_DTYPES)